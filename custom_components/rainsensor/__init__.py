@@ -2,40 +2,67 @@
 
 from __future__ import annotations
 
+import asyncio
+import bisect
 import logging
-from collections import deque
+import math
+from collections.abc import Mapping
 from datetime import datetime, timedelta
-from typing import TYPE_CHECKING
+from functools import partial
+from typing import TYPE_CHECKING, Any
 
 from homeassistant.components.recorder import history
-from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_ENTITY_ID, CONF_NAME
+from homeassistant.const import (
+    CONF_ENTITY_ID,
+    CONF_NAME,
+    STATE_OFF,
+    STATE_ON,
+    STATE_UNAVAILABLE,
+    STATE_UNKNOWN,
+)
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers import restore_state
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.event import (
     EventStateChangedData,
-    async_call_later,
     async_track_state_change_event,
-    async_track_time_interval,
 )
+from homeassistant.helpers.storage import Store
 from homeassistant.util import dt as dt_util
 
 if TYPE_CHECKING:
-    from .sensor import (
-        DailyOffCountSensorEntity,
-        DailyOnCountSensorEntity,
-        DailyRainSensorEntity,
-        DailyTiltSensorEntity,
-        RainfallRateSensorEntity,
-        TotalOffCountSensorEntity,
-        TotalOnCountSensorEntity,
-        TotalRainSensorEntity,
-        TotalTiltSensorEntity,
-    )
+    from .sensor import RainSensorEntity
 
 DOMAIN = "rainsensor"
+STORAGE_VERSION = 1
 _LOGGER = logging.getLogger(__name__)
 
+# States of the monitored binary sensor that count as bucket positions.
+_VALID_STATES = frozenset({STATE_ON, STATE_OFF})
+# Valid (old, new) state transitions mapped to the state whose flip they count.
+_TRANSITIONS = {(STATE_OFF, STATE_ON): STATE_ON, (STATE_ON, STATE_OFF): STATE_OFF}
+# Description keys of the entities affected by each kind of change. An "on" flip leaves the off
+# counters untouched and vice versa, a reset only touches the daily sensors and the periodic rate
+# update only the rate sensor.
+_SHARED_KEYS = ("daily_rain", "total_rain", "daily_tilt", "total_tilt", "rate")
+_ENTITY_GROUPS = {
+    "on": ("daily_on", "total_on", *_SHARED_KEYS),
+    "off": ("daily_off", "total_off", *_SHARED_KEYS),
+    "reset": ("daily_on", "daily_off", "daily_rain", "daily_tilt"),
+    "rate": ("rate",),
+    "all": ("daily_on", "daily_off", "total_on", "total_off", *_SHARED_KEYS),
+}
+# Last states of the count entities that carry no count to restore.
+_INVALID_RESTORE_STATES = frozenset({None, STATE_UNKNOWN, STATE_UNAVAILABLE})
+# Keys of the flip counters in the storage file, each holding a non-negative integer.
+_STORED_COUNTS = ("flips_on", "flips_off", "total_flips_on", "total_flips_off")
+# Seconds to wait before persisting changed counters, so a burst of tips is saved once.
+_SAVE_DELAY = 10
+# Seconds to coalesce entity writes after a flip, so bursts of tips during heavy rain push only once.
+_WRITE_DELAY = 0.25
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Rain Sensor from a config entry."""
@@ -59,17 +86,24 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Store the data handler in hass.data for access by other parts of the integration, like the sensor platform.
     hass.data[DOMAIN][entry.entry_id] = data_handler
 
+    # Load the flip counters persisted by the data handler before the entities publish their first state.
+    await data_handler.async_load_counts()
+
     # Forward the setup to the sensor platform to create the actual sensor entities.
     await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
 
     # Set up a listener for state changes on the monitored binary sensor entity (the rain gauge flip sensor).
+    # The list form registers the bound @callback directly in the per-entity dispatch table.
     data_handler.remove_state_listener = async_track_state_change_event(
-        hass, conf[CONF_ENTITY_ID], data_handler.handle_state_change
+        hass, [conf[CONF_ENTITY_ID]], data_handler.handle_state_change
     )
 
     # Restore any recent tip history from Home Assistant's recorder to handle restarts gracefully.
     await data_handler.restore_tip_history()
 
+    # Push the restored counters and rate to all entities in one pass.
+    data_handler.update_state()
+
     # Schedule daily resets at midnight and periodic rate updates.
     data_handler.schedule_midnight_reset()
     data_handler.schedule_rate_update()
@@ -97,12 +131,57 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if entry.entry_id in hass.data.get(DOMAIN, {}):
             data_handler: RainSensorDataHandler = hass.data[DOMAIN].pop(entry.entry_id)
             data_handler.unload()
+            # Write the counters now, so a reload of the entry loads the latest values.
+            await data_handler.async_save_counts()
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored counters when a config entry is removed."""
+    # The unique id is derived from the monitored entity, so a leftover file would be loaded again
+    # if the integration is added anew for the same sensor.
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.unique_id}").async_remove()
+
+
 class RainSensorDataHandler:
     """Handles data and logic for the Rain Sensor."""
 
+    # Fixed attribute layout, the state change callback reads many of these on every event.
+    __slots__ = (
+        "_enable_missed_flip_recovery",
+        "_entities",
+        "_entity_groups",
+        "_entity_id",
+        "_factor_per_ml",
+        "_flips_off",
+        "_flips_on",
+        "_funnel_diameter",
+        "_hass",
+        "_last_written",
+        "_midnight_reset_handle",
+        "_migrate_counts",
+        "_mm_per_off",
+        "_mm_per_on",
+        "_name",
+        "_pending_changed",
+        "_pending_write",
+        "_rate",
+        "_rate_update_handle",
+        "_rate_volume_ml",
+        "_state",
+        "_store",
+        "_tip_times",
+        "_tip_volumes",
+        "_total_flips_off",
+        "_total_flips_on",
+        "_total_state",
+        "_unique_id",
+        "_volume_per_tilt_off",
+        "_volume_per_tilt_on",
+        "device_info",
+        "remove_state_listener",
+    )
+
     def __init__(
         self,
         hass: HomeAssistant,
@@ -124,6 +203,8 @@ class RainSensorDataHandler:
         self._name = name
         self._unique_id = unique_id
         self._enable_missed_flip_recovery = enable_missed_flip_recovery
+        # Device info shared by all sensor entities, grouping them under one device in the UI.
+        self.device_info = DeviceInfo(identifiers={(DOMAIN, unique_id)}, name=name)
         # Initialize counters for flips (tilts) and states for rainfall amounts.
         self._flips_on: int = 0
         self._flips_off: int = 0
@@ -132,28 +213,41 @@ class RainSensorDataHandler:
         self._state: float = 0.0  # Daily rainfall in mm
         self._total_state: float = 0.0  # Total rainfall in mm
         self._rate: float = 0.0  # Rainfall rate in mm/h
-        # Use a deque for efficient management of recent tip history (last hour) for rate calculation.
-        self._tip_history: deque[tuple[datetime, float]] = deque()  # (time, volume_ml)
+        # Use two parallel lists for the recent tip history (last hour) for rate calculation:
+        # sorted monotonic event loop timestamps and the matching volumes in ml.
+        self._tip_times: list[float] = []
+        self._tip_volumes: list[float] = []
+        # Running sum of the volumes in the tip history, kept in step with appends and pops.
+        self._rate_volume_ml: float = 0.0
 
         # Precompute the conversion factor from volume (ml) to rain depth (mm) based on funnel area.
         # This avoids recalculating pi*r^2 every time and ensures efficiency.
-        funnel_area_mm2 = (funnel_diameter / 2.0) ** 2 * 3.141592653589793
+        funnel_area_mm2 = (funnel_diameter * 0.5) ** 2 * math.pi
         self._factor_per_ml = 1000.0 / funnel_area_mm2 if funnel_area_mm2 > 0 else 0.0
+        # Rain depth in mm contributed by a single flip to each state.
+        self._mm_per_on = volume_per_tilt_on * self._factor_per_ml
+        self._mm_per_off = volume_per_tilt_off * self._factor_per_ml
 
-        # References to sensor entities will be set later during setup for updating states.
-        self.daily_on_entity: DailyOnCountSensorEntity | None = None
-        self.daily_off_entity: DailyOffCountSensorEntity | None = None
-        self.total_on_entity: TotalOnCountSensorEntity | None = None
-        self.total_off_entity: TotalOffCountSensorEntity | None = None
-        self.daily_rain_entity: DailyRainSensorEntity | None = None
-        self.total_rain_entity: TotalRainSensorEntity | None = None
-        self.daily_tilt_entity: DailyTiltSensorEntity | None = None
-        self.total_tilt_entity: TotalTiltSensorEntity | None = None
-        self.rate_entity: RainfallRateSensorEntity | None = None
+        # One storage file per handler holding all flip counters, saved with a delay after changes.
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{unique_id}"
+        )
+        # Set when nothing was stored yet, so the counts are migrated once the entities exist.
+        self._migrate_counts: bool = False
+
+        # Sensor entities by description key, registered later during setup for updating states.
+        self._entities: dict[str, RainSensorEntity] = {}
+        # Cached tuples of the entities affected by each kind of change, built once by register_entities().
+        self._entity_groups: dict[str, tuple[RainSensorEntity, ...]] = {}
+        # Counters and rate of the last entity push, used to skip redundant writes.
+        self._last_written: tuple[int, int, int, int, float] | None = None
         # Placeholders for listener removal callbacks to clean up on unload.
         self.remove_state_listener: callback | None = None
-        self._remove_midnight_reset: callback | None = None
-        self._remove_rate_update: callback | None = None
+        self._midnight_reset_handle: asyncio.TimerHandle | None = None
+        # Timer and entity group of the coalesced write after a flip.
+        self._pending_write: asyncio.TimerHandle | None = None
+        self._pending_changed: str = "all"
+        self._rate_update_handle: asyncio.TimerHandle | None = None
 
     @property
     def name(self) -> str:
@@ -190,159 +284,277 @@ class RainSensorDataHandler:
         """Return the total tilt count."""
         return self._total_flips_on + self._total_flips_off
 
-    @property
-    def unit_of_measurement(self) -> str:
-        """Return the unit of measurement for rainfall."""
-        return "mm"
-
-    @property
-    def icon(self) -> str:
-        """Return the icon for rainfall sensors."""
-        return "mdi:weather-pouring"
-
-    @property
-    def device_class(self) -> SensorDeviceClass:
-        """Return the device class for rainfall."""
-        return SensorDeviceClass.PRECIPITATION
-
-    @property
-    def state_class(self) -> SensorStateClass:
-        """Return the state class for rainfall."""
-        return SensorStateClass.TOTAL
-
     @callback
     def handle_state_change(self, event: EventStateChangedData) -> None:
         """Handle state changes of the monitored binary sensor."""
-        # Extract old and new states from the event for comparison.
-        old_state_obj = event.data.get("old_state")
-        new_state_obj = event.data.get("new_state")
+        # Extract old and new states from the event for comparison. Both keys are always present.
+        data = event.data
+        old_state_obj = data["old_state"]
+        new_state_obj = data["new_state"]
 
         old_state = old_state_obj.state if old_state_obj else None
         new_state = new_state_obj.state if new_state_obj else None
 
-        _LOGGER.debug(f"State change detected: old={old_state}, new={new_state}")
+        # Drop attribute-only updates first, they can never count a flip without recovery.
+        if old_state == new_state and not self._enable_missed_flip_recovery:
+            return
 
+        _LOGGER.debug("State change detected: old=%s, new=%s", old_state, new_state)
+
+        # Real transitions are the common case, so they are looked up first. Only the two valid
+        # transitions are in the table, which also rules out invalid and initial states.
+        changed = _TRANSITIONS.get((old_state, new_state))
+        if changed == STATE_ON:
+            self._flips_on += 1
+            self._total_flips_on += 1
+            volume = self._volume_per_tilt_on
+        elif changed == STATE_OFF:
+            self._flips_off += 1
+            self._total_flips_off += 1
+            volume = self._volume_per_tilt_off
+        # Same-state events only get here with recovery enabled, as flips might have been missed.
+        elif old_state == new_state and new_state in _VALID_STATES:
+            # Same state, but event fired: assume missed even number of flips (at least two)
+            _LOGGER.debug("Same state event: assuming missed flips")
+            self._flips_on += 1
+            self._flips_off += 1
+            self._total_flips_on += 1
+            self._total_flips_off += 1
+            volume = self._volume_per_tilt_on + self._volume_per_tilt_off
+            changed = "all"
         # Ignore invalid states to prevent processing errors.
-        if new_state not in ("on", "off"):
-            _LOGGER.debug(f"Ignoring invalid state: {new_state}")
+        else:
+            if new_state not in _VALID_STATES:
+                _LOGGER.debug("Ignoring invalid state: %s", new_state)
+            elif old_state is None:
+                _LOGGER.debug("Initial state, ignoring.")
+            else:
+                _LOGGER.debug("Ignoring invalid old state: %s", old_state)
             return
 
-        if old_state is None:
-            _LOGGER.debug("Initial state, ignoring.")
-            return
+        # A flip was detected, record the tip with timestamp, update rate and states and schedule the entity writes.
+        now_ts = self._hass.loop.time()
+        self._tip_times.append(now_ts)
+        self._tip_volumes.append(volume)
+        self._rate_volume_ml += volume
+        self._prune_history(now_ts)
+        self._update_rate()
+        self._calculate_state()
+        self._schedule_save()
+        # Bouncing buckets and heavy rain can fire many events within a short time, so the writes
+        # are coalesced into one pass shortly after the first flip. Mixed flips write all entities.
+        if self._pending_write is None:
+            self._pending_changed = changed
+            self._pending_write = self._hass.loop.call_later(
+                _WRITE_DELAY, self._flush_state
+            )
+        elif self._pending_changed != changed:
+            self._pending_changed = "all"
 
-        if old_state not in ("on", "off"):
-            _LOGGER.debug(f"Ignoring invalid old state: {old_state}")
-            return
+    @callback
+    def _flush_state(self) -> None:
+        """Write the entity states coalesced from recent flips."""
+        self._pending_write = None
+        self._write_entities(self._pending_changed)
 
-        # Initialize variables for volume addition and flip detection.
-        volume = 0.0
-        flipped = False
-
-        # Detect actual state transitions (flips) and increment counters accordingly.
-        if old_state != new_state:
-            # Actual transition
-            flipped = True
-            if new_state == "on":
-                self._flips_on += 1
-                self._total_flips_on += 1
-                volume = self._volume_per_tilt_on
-            elif new_state == "off":
-                self._flips_off += 1
-                self._total_flips_off += 1
-                volume = self._volume_per_tilt_off
-        # If recovery is enabled, handle cases where flips might have been missed (same state but event triggered).
-        elif self._enable_missed_flip_recovery:
-            # Same state, but event fired: assume missed even number of flips (at least two)
-            _LOGGER.debug("Same state event: assuming missed flips")
-            flipped = True
-            if old_state == "on":
-                self._flips_off += 1  # Missed to off
-                self._flips_on += 1  # Missed back to on
-                self._total_flips_off += 1
-                self._total_flips_on += 1
-                volume = self._volume_per_tilt_off + self._volume_per_tilt_on
-            elif old_state == "off":
-                self._flips_on += 1  # Missed to on
-                self._flips_off += 1  # Missed back to off
-                self._total_flips_on += 1
-                self._total_flips_off += 1
-                volume = self._volume_per_tilt_on + self._volume_per_tilt_off
-
-        # If a flip was detected, record the tip with timestamp and update rate.
-        if flipped:
-            now = datetime.now(dt_util.get_default_time_zone())
-            self._tip_history.append((now, volume))
-            self._prune_history()
-            self._update_rate()
-
-        # Always update the rainfall states after potential changes.
-        self.update_state()
-
-    def update_state(self) -> None:
-        """Calculate rainfall in mm and notify the entities."""
-        # Calculate daily and total volumes in ml from flip counts.
-        daily_volume_ml = (self._volume_per_tilt_on * self._flips_on) + (
-            self._volume_per_tilt_off * self._flips_off
-        )
-        # Convert to mm using precomputed factor, rounding to one decimal and ensuring non-negative.
-        self._state = (
-            round(daily_volume_ml * self._factor_per_ml, 1)
-            if daily_volume_ml >= 0
-            else 0.0
+    @callback
+    def update_state(self, changed: str = "all") -> None:
+        """Calculate rainfall in mm and notify the entities affected by the change."""
+        self._calculate_state()
+        self._write_entities(changed)
+
+    def _calculate_state(self) -> None:
+        """Calculate the daily and total rainfall in mm from the flip counts."""
+        # Weight the flip counts with the precomputed mm per flip, rounding to one decimal.
+        # Results are never negative since flip counters only increase and volumes per tilt are positive.
+        self._state = round(
+            self._mm_per_on * self._flips_on + self._mm_per_off * self._flips_off, 1
         )
-        total_volume_ml = (self._volume_per_tilt_on * self._total_flips_on) + (
-            self._volume_per_tilt_off * self._total_flips_off
+        self._total_state = round(
+            self._mm_per_on * self._total_flips_on
+            + self._mm_per_off * self._total_flips_off,
+            1,
         )
-        self._total_state = (
-            round(total_volume_ml * self._factor_per_ml, 1)
-            if total_volume_ml >= 0
-            else 0.0
+
+    def _write_entities(self, changed: str) -> None:
+        """Write the states of the entities affected by the change."""
+        # `changed` selects the entity group to write: "on", "off", "reset", "rate" or "all".
+        # A pending coalesced write is folded into this one, so no flip is left unwritten.
+        if self._pending_write is not None:
+            self._pending_write.cancel()
+            self._pending_write = None
+            if changed != self._pending_changed:
+                changed = "all"
+
+        # Skip the entity writes if nothing changed since the last push. The counters and the rate
+        # determine every sensor value, so comparing them also covers changes hidden by rounding.
+        values = (
+            self._flips_on,
+            self._flips_off,
+            self._total_flips_on,
+            self._total_flips_off,
+            self._rate,
         )
+        if values == self._last_written:
+            return
+        self._last_written = values
 
-        # Trigger state updates for all associated sensor entities if they exist.
-        for entity in [
-            self.daily_on_entity,
-            self.daily_off_entity,
-            self.total_on_entity,
-            self.total_off_entity,
-            self.daily_rain_entity,
-            self.total_rain_entity,
-            self.daily_tilt_entity,
-            self.total_tilt_entity,
-            self.rate_entity,
-        ]:
-            if entity and entity.hass is not None:
+        # Trigger state updates for the affected sensor entities that are added to Home Assistant.
+        for entity in self._entity_groups.get(changed, ()):
+            if entity.hass is not None:
                 entity.async_write_ha_state()
 
-    def _prune_history(self) -> None:
+    def register_entities(self, entities: Mapping[str, RainSensorEntity]) -> None:
+        """Register the sensor entities by description key and cache them for state updates."""
+        # Build the groups of affected entities once, skipping keys without an entity.
+        self._entities = dict(entities)
+        self._entity_groups = {
+            group: tuple(self._entities[key] for key in keys if key in self._entities)
+            for group, keys in _ENTITY_GROUPS.items()
+        }
+
+    def _prune_history(self, now_ts: float | None = None) -> None:
         """Remove tips older than 1 hour."""
-        # Efficiently remove old entries from the front of the deque to keep only the last hour's data for rate calculation.
-        now = datetime.now(dt_util.get_default_time_zone())
-        while self._tip_history and (now - self._tip_history[0][0]) > timedelta(
-            hours=1
-        ):
-            self._tip_history.popleft()
+        # Efficiently remove old entries from the front of the lists to keep only the last hour's data for rate calculation.
+        # The timestamps are sorted, so a binary search finds all expired tips and one slice deletion drops them.
+        # The running volume sum is reduced by the removed tips so it always matches the lists.
+        # Callers that already hold the current loop time pass it in to avoid fetching it twice.
+        if now_ts is None:
+            now_ts = self._hass.loop.time()
+        idx = bisect.bisect_left(self._tip_times, now_ts - 3600.0)
+        if idx:
+            self._rate_volume_ml -= math.fsum(self._tip_volumes[:idx])
+            del self._tip_times[:idx]
+            del self._tip_volumes[:idx]
 
     def _update_rate(self) -> None:
         """Update the rainfall rate based on tips in the last hour."""
-        # Sum volumes from the last hour and convert to mm/h (since it's over 1 hour, rate is just the total mm).
-        total_volume_ml = sum(volume for _, volume in self._tip_history)
+        # Convert the running volume of the last hour to mm/h (since it's over 1 hour, rate is just the total mm).
+        # The running sum can drift a hair below zero once all tips are pruned, so clamp it.
         self._rate = (
-            round(total_volume_ml * self._factor_per_ml, 1)
-            if total_volume_ml >= 0
+            round(self._rate_volume_ml * self._factor_per_ml, 1)
+            if self._rate_volume_ml > 0
             else 0.0
         )
 
+    async def async_load_counts(self) -> None:
+        """Load the flip counters from storage."""
+        data = await self._store.async_load()
+        if data is None:
+            # Nothing stored yet, so the counts are migrated from the entity states of earlier
+            # versions. That needs the entities, so it is left to async_migrate_counts().
+            self._migrate_counts = True
+            return
+        if not isinstance(data, dict) or not all(
+            isinstance(count := data.get(key), int) and count >= 0
+            for key in _STORED_COUNTS
+        ):
+            # A partial or hand-edited file cannot be trusted, so migrate as if nothing was stored.
+            _LOGGER.warning("Ignoring malformed stored flip counters: %s", data)
+            self._migrate_counts = True
+            return
+        # Totals are cumulative, daily counts are only loaded if they were saved on the same day.
+        self._total_flips_on = data["total_flips_on"]
+        self._total_flips_off = data["total_flips_off"]
+        today = datetime.now(dt_util.get_default_time_zone()).date().isoformat()
+        if data.get("date") == today:
+            self._flips_on = data["flips_on"]
+            self._flips_off = data["flips_off"]
+        # Derive the rainfall from the loaded counts, so the rain entities start from them as well.
+        self._calculate_state()
+
+    async def async_migrate_counts(self) -> None:
+        """Migrate the flip counters from the restore cache if nothing was stored yet."""
+        if not self._migrate_counts:
+            return
+        self._migrate_counts = False
+        self.async_restore_all()
+        # Save them right away, since those restore cache entries are no longer refreshed and expire.
+        await self.async_save_counts()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the flip counters to persist, stamped with the current date."""
+        return {
+            "date": datetime.now(dt_util.get_default_time_zone()).date().isoformat(),
+            "flips_on": self._flips_on,
+            "flips_off": self._flips_off,
+            "total_flips_on": self._total_flips_on,
+            "total_flips_off": self._total_flips_off,
+        }
+
+    @callback
+    def _schedule_save(self) -> None:
+        """Schedule a delayed save of the flip counters."""
+        # Pending saves are also written when Home Assistant stops.
+        self._store.async_delay_save(self._data_to_save, _SAVE_DELAY)
+
+    async def async_save_counts(self) -> None:
+        """Save the flip counters immediately, replacing any pending delayed save."""
+        await self._store.async_save(self._data_to_save())
+
+    @callback
+    def async_restore_all(self) -> None:
+        """Restore the flip counters from the count entity states saved by earlier versions."""
+        # Read the restore cache once for all count entities instead of once per entity. This runs
+        # before the entities are added, so they publish the restored values with their first state.
+        last_states = restore_state.async_get(self._hass).last_states
+        # The restore cache is keyed by entity_id, which is only assigned when an entity is added,
+        # so the entity ids are looked up in the entity registry by unique id.
+        entity_registry = er.async_get(self._hass)
+        # Home Assistant keeps the default time zone in sync with the configured one, so it can
+        # be used directly instead of looking up the configured zone by name.
+        tz = dt_util.get_default_time_zone()
+        today = datetime.now(tz).date()
+
+        def restored_count(entity: RainSensorEntity | None, daily: bool) -> int:
+            """Return the restored count of an entity, or 0 if there is none."""
+            if entity is None:
+                return 0
+            entity_id = entity_registry.async_get_entity_id(
+                "sensor", DOMAIN, entity.unique_id
+            )
+            if entity_id is None or (stored := last_states.get(entity_id)) is None:
+                return 0
+            last_state = stored.state
+            if last_state.state in _INVALID_RESTORE_STATES:
+                return 0
+            # Daily counts are only restored if they are from the same day to avoid carrying over old data.
+            if daily and last_state.last_updated.astimezone(tz).date() != today:
+                return 0
+            # The counts are stored as integer strings, so try int() first and only fall back to
+            # parsing a float for states like "3.0".
+            value = last_state.state
+            try:
+                return int(value)
+            except ValueError:
+                pass
+            try:
+                return int(float(value))
+            except (ValueError, TypeError, OverflowError):
+                return 0
+
+        entities = self._entities
+        self._flips_on = restored_count(entities.get("daily_on"), True)
+        self._flips_off = restored_count(entities.get("daily_off"), True)
+        # Totals are restored without day check, as they are cumulative across restarts.
+        self._total_flips_on = restored_count(entities.get("total_on"), False)
+        self._total_flips_off = restored_count(entities.get("total_off"), False)
+        # Derive the rainfall from the restored counts, so the rain entities start from them as well.
+        self._calculate_state()
+
     async def restore_tip_history(self) -> None:
         """Restore tip history from the last hour using recorder data."""
         # Define time range for the last hour in UTC for querying the recorder.
-        start_time = dt_util.utcnow() - timedelta(hours=1)
+        # The loop time is taken together with end_time so that state ages map onto the same instant.
         end_time = dt_util.utcnow()
+        now_ts = self._hass.loop.time()
+        start_time = end_time - timedelta(hours=1)
 
         # Fetch significant state changes from the recorder in a background job to avoid blocking.
         states = await self._hass.async_add_executor_job(
-            lambda: history.get_significant_states(
+            partial(
+                history.get_significant_states,
                 self._hass,
                 start_time,
                 end_time,
@@ -354,8 +566,10 @@ class RainSensorDataHandler:
         if not states:
             return
 
-        # Sort states by timestamp and reconstruct tips from transitions.
-        states.sort(key=lambda s: s.last_changed)
+        # Reconstruct tips from transitions. The recorder returns the states in chronological order.
+        # Historical timestamps are mapped onto the event loop's monotonic clock via their age.
+        cutoff = now_ts - 3600.0
+        new_tips: list[tuple[float, float]] = []
         prev_state = None
         for state in states:
             if prev_state is None:
@@ -364,19 +578,22 @@ class RainSensorDataHandler:
             old = prev_state.state
             new = state.state
             # Only count valid transitions as tips.
-            if old != new and old in ("on", "off") and new in ("on", "off"):
-                if new == "on":
+            if old != new and old in _VALID_STATES and new in _VALID_STATES:
+                if new == STATE_ON:
                     volume = self._volume_per_tilt_on
                 else:
                     volume = self._volume_per_tilt_off
-                tip_time = state.last_changed.astimezone(
-                    dt_util.get_default_time_zone()
-                )
-                self._tip_history.append((tip_time, volume))
+                tip_ts = now_ts - (end_time - state.last_changed).total_seconds()
+                # Only keep tips inside the rate window, so no prune pass is needed afterwards.
+                if tip_ts >= cutoff:
+                    new_tips.append((tip_ts, volume))
             prev_state = state
 
-        # Prune and update rate after restoring history.
-        self._prune_history()
+        # Add the restored tips in one batch and update the rate. They go in front of any tip that
+        # arrived while the recorder was queried, which keeps the timestamps sorted.
+        self._tip_times[:0] = [tip_ts for tip_ts, _ in new_tips]
+        self._tip_volumes[:0] = [volume for _, volume in new_tips]
+        self._rate_volume_ml += math.fsum(volume for _, volume in new_tips)
         self._update_rate()
 
     def schedule_midnight_reset(self) -> None:
@@ -388,34 +605,45 @@ class RainSensorDataHandler:
         )
         seconds_until_midnight = (midnight - now).total_seconds()
 
-        self._remove_midnight_reset = async_call_later(
-            self._hass, seconds_until_midnight, self.reset_sensor
+        # Convert to a deadline on the event loop's monotonic clock once and arm the timer directly.
+        # The loop invokes the bound @callback itself, so no HassJob is built or inspected per fire.
+        if self._midnight_reset_handle:
+            self._midnight_reset_handle.cancel()
+        self._midnight_reset_handle = self._hass.loop.call_at(
+            self._hass.loop.time() + seconds_until_midnight, self.reset_sensor
         )
 
     @callback
-    def reset_sensor(self, _: datetime) -> None:
+    def reset_sensor(self) -> None:
         """Reset daily counters and state at midnight."""
         # Reset daily flips and update states, then reschedule for next midnight.
         self._flips_on = 0
         self._flips_off = 0
-        self.update_state()
+        self.update_state("reset")
+        self._schedule_save()
         self.schedule_midnight_reset()
 
     def schedule_rate_update(self) -> None:
         """Schedule periodic update for rainfall rate."""
-        # Set up a recurring interval to prune history and update rate every minute.
-        self._remove_rate_update = async_track_time_interval(
-            self._hass, self.periodic_rate_update, timedelta(minutes=1)
+        # Arm a plain event loop timer to prune history and update rate in one minute.
+        # The callback re-arms itself, which avoids building a datetime on every interval.
+        # A still pending timer is cancelled so that only one is ever armed.
+        if self._rate_update_handle:
+            self._rate_update_handle.cancel()
+        self._rate_update_handle = self._hass.loop.call_later(
+            60, self.periodic_rate_update
         )
 
     @callback
-    def periodic_rate_update(self, now: datetime) -> None:
+    def periodic_rate_update(self) -> None:
         """Periodic prune and update for rainfall rate."""
-        # Prune old tips, recalculate rate, and update the rate entity if it exists.
+        # Prune old tips, recalculate rate, and update the rate entity if it changed.
+        # The running volume sum is re-derived exactly once a minute to bound floating point drift.
         self._prune_history()
+        self._rate_volume_ml = math.fsum(self._tip_volumes)
         self._update_rate()
-        if self.rate_entity:
-            self.rate_entity.async_write_ha_state()
+        self.update_state("rate")
+        self.schedule_rate_update()
 
     def unload(self) -> None:
         """Clean up listeners on unload."""
@@ -423,12 +651,15 @@ class RainSensorDataHandler:
         if self.remove_state_listener:
             self.remove_state_listener()
             self.remove_state_listener = None
-        if self._remove_midnight_reset:
-            self._remove_midnight_reset()
-            self._remove_midnight_reset = None
-        if self._remove_rate_update:
-            self._remove_rate_update()
-            self._remove_rate_update = None
+        if self._midnight_reset_handle:
+            self._midnight_reset_handle.cancel()
+            self._midnight_reset_handle = None
+        if self._rate_update_handle:
+            self._rate_update_handle.cancel()
+            self._rate_update_handle = None
+        if self._pending_write:
+            self._pending_write.cancel()
+            self._pending_write = None
 
     @callback
     def async_unload(self) -> None:
@@ -4,18 +4,22 @@
 
 import json
 import sys
+import tomllib
 
-import toml
+PYPROJECT_PATH = "pyproject.toml"
+MANIFEST_PATH = "custom_components/rainsensor/manifest.json"
 
 try:
-    pyproject = toml.load("pyproject.toml")
+    with open(PYPROJECT_PATH, "rb") as f:
+        pyproject = tomllib.load(f)
     py_version = pyproject["project"]["version"]
 except (FileNotFoundError, KeyError):
     print("Could not find version in pyproject.toml")
     sys.exit(1)
 
 try:
-    with open("custom_components/rainsensor/manifest.json") as f:
+    # Parse the manifest, so only the top-level version counts and not a nested "version" key.
+    with open(MANIFEST_PATH, "rb") as f:
         manifest = json.load(f)
     manifest_version = manifest["version"]
 except (FileNotFoundError, KeyError):
@@ -1,30 +1,40 @@
 """Shared fixtures for Rain Sensor tests."""
 
+from types import MappingProxyType
 from unittest.mock import patch
 
 import pytest
 from homeassistant import config_entries
 from homeassistant.const import CONF_ENTITY_ID, CONF_NAME
 from homeassistant.core import HomeAssistant
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.helpers import restore_state
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    mock_restore_cache,
+)
 
-from custom_components.rainsensor import DOMAIN
+from custom_components.rainsensor import DOMAIN, RainSensorDataHandler
 
-
-@pytest.fixture(autouse=True)
-def auto_enable_recorder_mock(recorder_mock):
-    """Auto-enable recorder mock for all tests."""
-    return recorder_mock
+# Read-only config entry data shared by every test; MockConfigEntry does not mutate it.
+_CONFIG_ENTRY_DATA = MappingProxyType({
+    CONF_ENTITY_ID: "binary_sensor.rain_tip",
+    "volume_per_tilt_on": 2.0,
+    "volume_per_tilt_off": 2.0,
+    "funnel_diameter": 100.0,
+    CONF_NAME: "Test Rain",
+    "enable_missed_flip_recovery": False,
+})
 
 
+# The recorder_mock fixture is function scoped, so the test environment has to be too.
 @pytest.fixture(autouse=True)
-def mock_history_get_significant_states():
-    """Mock history get significant states."""
+def auto_test_env(recorder_mock):
+    """Enable the recorder mock and stub out the history lookup for all tests."""
     with patch(
         "homeassistant.components.recorder.history.get_significant_states",
         return_value={},
     ):
-        yield
+        yield recorder_mock
 
 
 @pytest.fixture
@@ -35,14 +45,7 @@ async def config_entry(hass: HomeAssistant, enable_custom_integrations):
         minor_version=1,
         domain=DOMAIN,
         title="Test Rain",
-        data={
-            CONF_ENTITY_ID: "binary_sensor.rain_tip",
-            "volume_per_tilt_on": 2.0,
-            "volume_per_tilt_off": 2.0,
-            "funnel_diameter": 100.0,
-            CONF_NAME: "Test Rain",
-            "enable_missed_flip_recovery": False,
-        },
+        data=_CONFIG_ENTRY_DATA,
         source=config_entries.SOURCE_USER,
         entry_id="test_entry",
         unique_id="test_entry",
@@ -51,3 +54,46 @@ async def config_entry(hass: HomeAssistant, enable_custom_integrations):
     )
     entry.add_to_hass(hass)
     return entry
+
+
+@pytest.fixture
+def data_handler(hass: HomeAssistant):
+    """Fixture for a data handler that is not set up through a config entry."""
+    handler = RainSensorDataHandler(
+        hass,
+        "binary_sensor.rain_tip",
+        2.0,
+        2.0,
+        100.0,
+        "Test Rain",
+        "test_unique",
+        False,
+    )
+    yield handler
+    handler.unload()  # Cleanup
+
+
+@pytest.fixture
+def seeded_data_handler(data_handler):
+    """Fixture for a data handler with fixed counters and two tips in the rate window."""
+    (
+        data_handler._flips_on,
+        data_handler._flips_off,
+        data_handler._total_flips_on,
+        data_handler._total_flips_off,
+    ) = (3, 2, 6, 4)
+    now_ts = data_handler._hass.loop.time()
+    data_handler._tip_times[:] = [now_ts - 60.0, now_ts]
+    data_handler._tip_volumes[:] = [2.0, 2.0]
+    data_handler._rate_volume_ml = 4.0
+    # Derive the rainfall and rate from the seeded values, as a flip does.
+    data_handler._update_rate()
+    data_handler._calculate_state()
+    return data_handler
+
+
+@pytest.fixture
+def last_states(hass: HomeAssistant) -> dict[str, restore_state.StoredState]:
+    """Fixture for the restore cache, installed once and filled per case by the test."""
+    mock_restore_cache(hass, [])
+    return restore_state.async_get(hass).last_states
@@ -1,17 +1,32 @@
 """Test the Rain Sensor init."""
 
 import math
+from collections import namedtuple
+from datetime import timedelta
 from unittest.mock import MagicMock, patch
 
 import pytest
-from homeassistant.const import STATE_OFF, STATE_ON
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_STATE_CHANGED, STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant, State
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+    mock_restore_cache,
+)
 
 from custom_components.rainsensor import (
     DOMAIN,
+    STORAGE_VERSION,
     RainSensorDataHandler,
 )
 
+# Lightweight stand-ins for the state objects and state change events the handler reads.
+_S = namedtuple("_S", "state")
+_E = namedtuple("_E", "data")
+# Rain depth in mm per ml of tipped volume for the 100 mm funnel used throughout.
+FACTOR = 1000 / (math.pi * (50**2))
+
 
 @pytest.mark.asyncio
 async def test_setup_entry(
@@ -43,57 +58,60 @@ async def test_unload_entry(
 
 
 @pytest.mark.asyncio
-async def test_handle_state_change(
-    hass: HomeAssistant, enable_custom_integrations
+async def test_remove_entry(
+    hass: HomeAssistant, config_entry, enable_custom_integrations, hass_storage
 ) -> None:
-    """Test handling state changes."""
-    data_handler = RainSensorDataHandler(
-        hass,
-        "binary_sensor.rain_tip",
-        2.0,
-        2.0,
-        100.0,
-        "Test Rain",
-        "test_unique",
-        False,
-    )
+    """Test removing the entry deletes its stored counters."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
 
-    # Precompute expected factor
-    area = math.pi * (50**2)
-    factor = 1000 / area
+    key = f"{DOMAIN}.{config_entry.unique_id}"
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    assert key in hass_storage  # Written on unload
 
-    # Mock event
-    event = MagicMock()
-    event.data = {
-        "old_state": MagicMock(state=STATE_OFF),
-        "new_state": MagicMock(state=STATE_ON),
-    }
+    await hass.config_entries.async_remove(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert key not in hass_storage
+
+
+@pytest.mark.asyncio
+async def test_handle_state_change(
+    hass: HomeAssistant, data_handler, enable_custom_integrations
+) -> None:
+    """Test handling state changes."""
+    # Flip event
+    event = _E({
+        "old_state": _S(STATE_OFF),
+        "new_state": _S(STATE_ON),
+    })
     data_handler.handle_state_change(event)
     assert data_handler._flips_on == 1
     assert data_handler._total_flips_on == 1
-    assert data_handler.state == round(2.0 * factor, 1)
-    assert data_handler.total_state == round(2.0 * factor, 1)
+    assert data_handler.state == round(2.0 * FACTOR, 1)
+    assert data_handler.total_state == round(2.0 * FACTOR, 1)
     assert data_handler.daily_tilt_count == 1
     assert data_handler.total_tilt_count == 1
 
-    event.data = {
-        "old_state": MagicMock(state=STATE_ON),
-        "new_state": MagicMock(state=STATE_OFF),
-    }
+    event = _E({
+        "old_state": _S(STATE_ON),
+        "new_state": _S(STATE_OFF),
+    })
     data_handler.handle_state_change(event)
     assert data_handler._flips_off == 1
     assert data_handler._total_flips_off == 1
-    assert data_handler.state == round(4.0 * factor, 1)
-    assert data_handler.total_state == round(4.0 * factor, 1)
+    assert data_handler.state == round(4.0 * FACTOR, 1)
+    assert data_handler.total_state == round(4.0 * FACTOR, 1)
     assert data_handler.daily_tilt_count == 2
     assert data_handler.total_tilt_count == 2
 
     # Test same state without recovery
-    event.data = {
-        "old_state": MagicMock(state=STATE_OFF),
-        "new_state": MagicMock(state=STATE_OFF),
-    }
-    data_handler.handle_state_change(event)
+    event = _E({
+        "old_state": _S(STATE_OFF),
+        "new_state": _S(STATE_OFF),
+    })
+    with patch.object(RainSensorDataHandler, "_calculate_state") as mock_calculate:
+        data_handler.handle_state_change(event)
+        assert not mock_calculate.called  # No state update
     assert data_handler._flips_off == 1  # No change
     assert data_handler._total_flips_off == 1  # No change
     assert data_handler.daily_tilt_count == 2
@@ -106,46 +124,100 @@ async def test_handle_state_change(
     assert data_handler._flips_off == 2
     assert data_handler._total_flips_on == 2
     assert data_handler._total_flips_off == 2
-    assert data_handler.state == round(8.0 * factor, 1)
-    assert data_handler.total_state == round(8.0 * factor, 1)
+    assert data_handler.state == round(8.0 * FACTOR, 1)
+    assert data_handler.total_state == round(8.0 * FACTOR, 1)
     assert data_handler.daily_tilt_count == 4
     assert data_handler.total_tilt_count == 4
 
 
+@pytest.mark.asyncio
+async def test_update_state_skips_unchanged(
+    hass: HomeAssistant, data_handler, enable_custom_integrations
+) -> None:
+    """Test entities are only written when a value changed."""
+    entity = MagicMock()
+    data_handler.register_entities({"daily_on": entity})
+
+    data_handler.update_state()
+    assert entity.async_write_ha_state.call_count == 1
+    data_handler.update_state()
+    assert entity.async_write_ha_state.call_count == 1  # Unchanged
+
+    data_handler._flips_on = 1
+    data_handler.update_state()
+    assert entity.async_write_ha_state.call_count == 2
+
+    # A same-state event without recovery changes nothing and schedules no write
+    data_handler.handle_state_change(
+        _E({"old_state": _S(STATE_ON), "new_state": _S(STATE_ON)})
+    )
+    assert data_handler._pending_write is None
+    data_handler.update_state()
+    assert entity.async_write_ha_state.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_update_state_groups(
+    hass: HomeAssistant, data_handler, enable_custom_integrations
+) -> None:
+    """Test a flip only writes the entities whose values it changes."""
+    daily_on_entity = MagicMock()
+    daily_off_entity = MagicMock()
+    total_rain_entity = MagicMock()
+    data_handler.register_entities({
+        "daily_on": daily_on_entity,
+        "daily_off": daily_off_entity,
+        "total_rain": total_rain_entity,
+    })
+
+    event = _E({
+        "old_state": _S(STATE_OFF),
+        "new_state": _S(STATE_ON),
+    })
+    data_handler.handle_state_change(event)
+    # Writes are coalesced and happen shortly after the flip
+    assert daily_on_entity.async_write_ha_state.call_count == 0
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+    assert daily_on_entity.async_write_ha_state.call_count == 1
+    assert daily_off_entity.async_write_ha_state.call_count == 0
+    assert total_rain_entity.async_write_ha_state.call_count == 1
+
+    data_handler.reset_sensor()
+    assert daily_on_entity.async_write_ha_state.call_count == 2
+    assert daily_off_entity.async_write_ha_state.call_count == 1
+    assert total_rain_entity.async_write_ha_state.call_count == 1
+
+    # A pending flip write is folded into the next direct update
+    data_handler.handle_state_change(event)
+    data_handler.update_state("rate")
+    assert daily_on_entity.async_write_ha_state.call_count == 3
+    assert total_rain_entity.async_write_ha_state.call_count == 2
+
+
 @pytest.mark.asyncio
 async def test_midnight_reset(
-    hass: HomeAssistant, monkeypatch, enable_custom_integrations, freezer
+    hass: HomeAssistant, data_handler, monkeypatch, enable_custom_integrations, freezer
 ) -> None:
     """Test midnight reset scheduling and execution."""
     freezer.move_to("2025-07-16 12:00:00+00:00")  # Explicit UTC
     hass.config.time_zone = "UTC"
 
-    data_handler = RainSensorDataHandler(
-        hass,
-        "binary_sensor.rain_tip",
-        2.0,
-        2.0,
-        100.0,
-        "Test Rain",
-        "test_unique",
-        False,
-    )
     data_handler._flips_on = 5
     data_handler._flips_off = 5
     data_handler._total_flips_on = 5
     data_handler._total_flips_off = 5
     data_handler.update_state()
 
-    with patch(
-        "custom_components.rainsensor.async_call_later", return_value=MagicMock()
-    ) as mock_call_later:
+    with patch.object(hass.loop, "call_at", return_value=MagicMock()) as mock_call_at:
         data_handler.schedule_midnight_reset()
-        assert mock_call_later.called
+        assert mock_call_at.called
+        # Armed on the loop clock, at most one day ahead
+        assert 0 < mock_call_at.call_args[0][0] - hass.loop.time() <= 86400
 
-        mock_call_later.reset_mock()
+        mock_call_at.reset_mock()
 
         # Simulate reset
-        data_handler.reset_sensor(None)  # Callback expects dummy arg
+        data_handler.reset_sensor()
         assert data_handler._flips_on == 0
         assert data_handler._flips_off == 0
         assert data_handler.state == 0.0
@@ -154,6 +226,196 @@ async def test_midnight_reset(
         assert data_handler.total_state > 0
         assert data_handler.daily_tilt_count == 0
         assert data_handler.total_tilt_count == 10
-        assert mock_call_later.called  # Rescheduled
+        assert mock_call_at.called  # Rescheduled
+
+
+@pytest.mark.asyncio
+async def test_rate_window(
+    hass: HomeAssistant, data_handler, enable_custom_integrations, freezer
+) -> None:
+    """Test the rainfall rate only covers tips from the last hour."""
+    freezer.move_to("2025-07-16 12:00:00+00:00")
+
+    event = _E({
+        "old_state": _S(STATE_OFF),
+        "new_state": _S(STATE_ON),
+    })
+    data_handler.handle_state_change(event)
+    freezer.tick(1800)
+    data_handler.handle_state_change(event)
+    assert data_handler.rate == round(4.0 * FACTOR, 1)
+
+    # The first tip leaves the window
+    freezer.tick(1801)
+    data_handler.periodic_rate_update()
+    assert data_handler.rate == round(2.0 * FACTOR, 1)
+
+    # The second tip leaves the window
+    freezer.tick(1800)
+    data_handler.periodic_rate_update()
+    assert data_handler.rate == 0.0
+    assert data_handler._rate_volume_ml == 0.0
+
+
+@pytest.mark.asyncio
+async def test_restore_tip_history(
+    hass: HomeAssistant, enable_custom_integrations, freezer
+) -> None:
+    """Test the rate is reconstructed from recorder history."""
+    freezer.move_to("2025-07-16 12:00:00+00:00")
+    now = dt_util.utcnow()
+
+    data_handler = RainSensorDataHandler(
+        hass,
+        "binary_sensor.rain_tip",
+        2.0,
+        3.0,
+        100.0,
+        "Test Rain",
+        "test_unique",
+        False,
+    )
+
+    states = [
+        State(
+            "binary_sensor.rain_tip", STATE_OFF, last_changed=now - timedelta(hours=2)
+        ),
+        State(
+            "binary_sensor.rain_tip", STATE_ON, last_changed=now - timedelta(minutes=50)
+        ),
+        State(
+            "binary_sensor.rain_tip",
+            STATE_OFF,
+            last_changed=now - timedelta(minutes=10),
+        ),
+    ]
+    with patch(
+        "homeassistant.components.recorder.history.get_significant_states",
+        return_value={"binary_sensor.rain_tip": states},
+    ):
+        await data_handler.restore_tip_history()
+    assert data_handler.rate == round(5.0 * FACTOR, 1)
+
+    # The restored "on" tip leaves the window after ten more minutes
+    freezer.tick(601)
+    data_handler.periodic_rate_update()
+    assert data_handler.rate == round(3.0 * FACTOR, 1)
 
     data_handler.unload()  # Cleanup
+
+
+@pytest.mark.asyncio
+async def test_load_counts(
+    hass: HomeAssistant, config_entry, enable_custom_integrations, hass_storage
+) -> None:
+    """Test the counters are loaded from storage when the entry is set up."""
+    today = dt_util.now().date().isoformat()
+    hass_storage[f"{DOMAIN}.{config_entry.unique_id}"] = {
+        "version": STORAGE_VERSION,
+        "key": f"{DOMAIN}.{config_entry.unique_id}",
+        "data": {
+            "date": today,
+            "flips_on": 3,
+            "flips_off": 2,
+            "total_flips_on": 10,
+            "total_flips_off": 15,
+        },
+    }
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    # The loaded totals are the first states written, no zero is published before them.
+    first_states = {}
+    for event in events:
+        first_states.setdefault(event.data["entity_id"], event.data["new_state"].state)
+    assert first_states["sensor.test_rain_total_on_count"] == "10"
+    assert first_states["sensor.test_rain_total"] == str(round(50 * FACTOR, 1))
+    assert hass.states.get("sensor.test_rain_daily_on_count").state == "3"
+    assert hass.states.get("sensor.test_rain_daily_off_count").state == "2"
+    assert hass.states.get("sensor.test_rain_total_on_count").state == "10"
+    assert hass.states.get("sensor.test_rain_total_off_count").state == "15"
+
+
+@pytest.mark.asyncio
+async def test_load_counts_other_day(
+    hass: HomeAssistant, data_handler, hass_storage
+) -> None:
+    """Test daily counters saved on another day are not loaded."""
+    hass_storage[f"{DOMAIN}.test_unique"] = {
+        "version": STORAGE_VERSION,
+        "key": f"{DOMAIN}.test_unique",
+        "data": {
+            "date": "2000-01-01",
+            "flips_on": 3,
+            "flips_off": 2,
+            "total_flips_on": 10,
+            "total_flips_off": 15,
+        },
+    }
+    await data_handler.async_load_counts()
+    assert data_handler._flips_on == 0
+    assert data_handler._flips_off == 0
+    assert data_handler._total_flips_on == 10
+    assert data_handler._total_flips_off == 15
+
+
+@pytest.mark.asyncio
+async def test_load_counts_malformed(hass: HomeAssistant, hass_storage) -> None:
+    """Test a partial storage file is migrated again instead of loaded."""
+    hass_storage[f"{DOMAIN}.test_unique"] = {
+        "version": STORAGE_VERSION,
+        "key": f"{DOMAIN}.test_unique",
+        "data": {"date": dt_util.now().date().isoformat(), "flips_on": 3},
+    }
+    mock_restore_cache(hass, [])
+    data_handler = RainSensorDataHandler(
+        hass,
+        "binary_sensor.rain_tip",
+        2.0,
+        2.0,
+        100.0,
+        "Test Rain",
+        "test_unique",
+        False,
+    )
+    await data_handler.async_load_counts()
+    assert data_handler._flips_on == 0
+    assert data_handler._total_flips_on == 0
+
+    # The migration replaces the partial file with a complete one
+    await data_handler.async_migrate_counts()
+    assert hass_storage[f"{DOMAIN}.test_unique"]["data"] == {
+        "date": dt_util.now().date().isoformat(),
+        "flips_on": 0,
+        "flips_off": 0,
+        "total_flips_on": 0,
+        "total_flips_off": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_save_counts(
+    hass: HomeAssistant, config_entry, enable_custom_integrations, hass_storage
+) -> None:
+    """Test the counters are saved after a flip and on unload."""
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    hass.states.async_set("binary_sensor.rain_tip", STATE_OFF)
+    hass.states.async_set("binary_sensor.rain_tip", STATE_ON)
+    await hass.async_block_till_done()
+
+    # The save is delayed, so a burst of tips is written once
+    key = f"{DOMAIN}.{config_entry.unique_id}"
+    assert hass_storage[key]["data"]["flips_on"] == 0  # Saved by the initial migration
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+    await hass.async_block_till_done()
+    assert hass_storage[key]["data"]["flips_on"] == 1
+    assert hass_storage[key]["data"]["total_flips_on"] == 1
+
+    hass.states.async_set("binary_sensor.rain_tip", STATE_OFF)
+    await hass.async_block_till_done()
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    assert hass_storage[key]["data"]["flips_off"] == 1
+    assert hass_storage[key]["data"]["total_flips_off"] == 1
@@ -1,326 +1,228 @@
 """Test the Rain Sensor sensor."""
 
+import math
 from datetime import datetime, timedelta
-from unittest.mock import MagicMock, patch
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 import pytest
 from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant, State
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.restore_state import StoredState
 from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_capture_events
 
-from custom_components.rainsensor import DOMAIN, RainSensorDataHandler
+from custom_components.rainsensor import DOMAIN
 from custom_components.rainsensor.sensor import (
-    DailyOffCountSensorEntity,
-    DailyOnCountSensorEntity,
-    TotalOffCountSensorEntity,
-    TotalOnCountSensorEntity,
+    SENSOR_DESCRIPTIONS,
+    RainSensorEntity,
     async_setup_entry,
 )
 
+DESCRIPTIONS = {description.key: description for description in SENSOR_DESCRIPTIONS}
+# Time zone of the restored timestamps; the clock is pinned to midday UTC for the whole module.
+_TZ = dt_util.UTC
+# Rain depth in mm per ml of tipped volume for the 100 mm funnel of the data_handler fixture.
+FACTOR = 1000 / (math.pi * (50**2))
+
+# Expected unique ids and names of the entities of the data_handler fixture, by description key.
+EXPECTED_UNIQUE_IDS = {
+    "daily_on": "test_unique_daily_on_count",
+    "daily_off": "test_unique_daily_off_count",
+    "total_on": "test_unique_total_on_count",
+    "total_off": "test_unique_total_off_count",
+    "daily_rain": "test_unique_daily",
+    "total_rain": "test_unique_total",
+    "daily_tilt": "test_unique_daily_tilt",
+    "total_tilt": "test_unique_total_tilt",
+    "rate": "test_unique_rate",
+}
+EXPECTED_NAMES = {
+    "daily_on": "Test Rain Daily On Count",
+    "daily_off": "Test Rain Daily Off Count",
+    "total_on": "Test Rain Total On Count",
+    "total_off": "Test Rain Total Off Count",
+    "daily_rain": "Test Rain Daily",
+    "total_rain": "Test Rain Total",
+    "daily_tilt": "Test Rain Daily Tilt Count",
+    "total_tilt": "Test Rain Total Tilt Count",
+    "rate": "Test Rain Rainfall Rate",
+}
+
+pytestmark = pytest.mark.freeze_time("2025-07-17 12:00:00+00:00")
+
+
+@pytest.fixture(autouse=True)
+async def utc_time_zone(hass: HomeAssistant) -> None:
+    """Use UTC as the configured time zone, so the frozen instant is the same date everywhere."""
+    await hass.config.async_set_time_zone("UTC")
+
 
 @pytest.mark.asyncio
 async def test_sensor_setup(
-    hass: HomeAssistant, config_entry, enable_custom_integrations
+    hass: HomeAssistant, config_entry, enable_custom_integrations, seeded_data_handler
 ) -> None:
     """Test sensor entities setup."""
-    data_handler = RainSensorDataHandler(
-        hass,
-        "binary_sensor.rain_tip",
-        2.0,
-        2.0,
-        100.0,
-        "Test Rain",
-        config_entry.unique_id,
-        False,
-    )
+    data_handler = seeded_data_handler
     hass.data[DOMAIN] = {config_entry.entry_id: data_handler}
 
-    data_handler._flips_on = 3
-    data_handler._flips_off = 2
-    data_handler._total_flips_on = 6
-    data_handler._total_flips_off = 4
-    data_handler._state = 5.0
-    data_handler._total_state = 10.0
-    data_handler._rate = 2.5
-
     mock_add_entities = MagicMock()
     await async_setup_entry(hass, config_entry, mock_add_entities)
-    await hass.async_block_till_done()
 
     assert mock_add_entities.called
     added_entities = mock_add_entities.call_args[0][0]
     assert len(added_entities) == 9
-    daily_on_entity = added_entities[0]
-    daily_off_entity = added_entities[1]
-    total_on_entity = added_entities[2]
-    total_off_entity = added_entities[3]
-    daily_rain_entity = added_entities[4]
-    total_rain_entity = added_entities[5]
-    daily_tilt_entity = added_entities[6]
-    total_tilt_entity = added_entities[7]
-    rate_entity = added_entities[8]
-
-    # Daily on count assertions
-    assert daily_on_entity.unique_id == f"{config_entry.unique_id}_daily_on_count"
-    assert daily_on_entity.name == f"{data_handler.name} Daily On Count"
-    assert daily_on_entity.native_unit_of_measurement == "counts"
-    assert daily_on_entity.icon == "mdi:counter"
-    assert daily_on_entity.state_class == SensorStateClass.TOTAL
-    assert daily_on_entity.native_value == 3
-
-    # Daily off count assertions
-    assert daily_off_entity.unique_id == f"{config_entry.unique_id}_daily_off_count"
-    assert daily_off_entity.name == f"{data_handler.name} Daily Off Count"
-    assert daily_off_entity.native_unit_of_measurement == "counts"
-    assert daily_off_entity.icon == "mdi:counter"
-    assert daily_off_entity.state_class == SensorStateClass.TOTAL
-    assert daily_off_entity.native_value == 2
-
-    # Total on count assertions
-    assert total_on_entity.unique_id == f"{config_entry.unique_id}_total_on_count"
-    assert total_on_entity.name == f"{data_handler.name} Total On Count"
-    assert total_on_entity.native_unit_of_measurement == "counts"
-    assert total_on_entity.icon == "mdi:counter"
-    assert total_on_entity.state_class == SensorStateClass.TOTAL_INCREASING
-    assert total_on_entity.native_value == 6
-
-    # Total off count assertions
-    assert total_off_entity.unique_id == f"{config_entry.unique_id}_total_off_count"
-    assert total_off_entity.name == f"{data_handler.name} Total Off Count"
-    assert total_off_entity.native_unit_of_measurement == "counts"
-    assert total_off_entity.icon == "mdi:counter"
-    assert total_off_entity.state_class == SensorStateClass.TOTAL_INCREASING
-    assert total_off_entity.native_value == 4
-
-    # Daily rain assertions
-    assert daily_rain_entity.unique_id == f"{config_entry.unique_id}_daily"
-    assert daily_rain_entity.name == f"{data_handler.name} Daily"
-    assert daily_rain_entity.native_unit_of_measurement == "mm"
-    assert daily_rain_entity.icon == "mdi:weather-pouring"
-    assert daily_rain_entity.device_class == SensorDeviceClass.PRECIPITATION
-    assert daily_rain_entity.state_class == SensorStateClass.TOTAL
-    assert daily_rain_entity.native_value == 5.0
-
-    # Total rain assertions
-    assert total_rain_entity.unique_id == f"{config_entry.unique_id}_total"
-    assert total_rain_entity.name == f"{data_handler.name} Total"
-    assert total_rain_entity.native_unit_of_measurement == "mm"
-    assert total_rain_entity.icon == "mdi:weather-pouring"
-    assert total_rain_entity.device_class == SensorDeviceClass.PRECIPITATION
-    assert total_rain_entity.state_class == SensorStateClass.TOTAL_INCREASING
-    assert total_rain_entity.native_value == 10.0
-
-    # Daily tilt assertions
-    assert daily_tilt_entity.unique_id == f"{config_entry.unique_id}_daily_tilt"
-    assert daily_tilt_entity.name == f"{data_handler.name} Daily Tilt Count"
-    assert daily_tilt_entity.native_unit_of_measurement == "tips"
-    assert daily_tilt_entity.icon == "mdi:counter"
-    assert daily_tilt_entity.state_class == SensorStateClass.TOTAL
-    assert daily_tilt_entity.native_value == 5
-
-    # Total tilt assertions
-    assert total_tilt_entity.unique_id == f"{config_entry.unique_id}_total_tilt"
-    assert total_tilt_entity.name == f"{data_handler.name} Total Tilt Count"
-    assert total_tilt_entity.native_unit_of_measurement == "tips"
-    assert total_tilt_entity.icon == "mdi:counter"
-    assert total_tilt_entity.state_class == SensorStateClass.TOTAL_INCREASING
-    assert total_tilt_entity.native_value == 10
-
-    # Rate assertions
-    assert rate_entity.unique_id == f"{config_entry.unique_id}_rate"
-    assert rate_entity.name == f"{data_handler.name} Rainfall Rate"
-    assert rate_entity.native_unit_of_measurement == "mm/h"
-    assert rate_entity.icon == "mdi:weather-rainy"
-    assert rate_entity.device_class == SensorDeviceClass.PRECIPITATION_INTENSITY
-    assert rate_entity.state_class == SensorStateClass.MEASUREMENT
-    assert rate_entity.native_value == 2.5
-
-    # Device info shared
-    for entity in added_entities:
-        assert entity.device_info == DeviceInfo(
-            identifiers={(DOMAIN, config_entry.unique_id)},
-            name=data_handler.name,
-        )
-
-
-@pytest.mark.asyncio
-async def test_daily_on_restore(
-    hass: HomeAssistant, enable_custom_integrations, freezer
-) -> None:
-    """Test restoring daily on count."""
-    freezer.move_to("2025-07-17 12:00:00+00:00")
-    hass.config.time_zone = "UTC"
-
-    data_handler = RainSensorDataHandler(
-        hass,
-        "binary_sensor.rain_tip",
-        2.0,
-        2.0,
-        100.0,
-        "Test Rain",
-        "test_unique",
-        False,
+    total, increasing = SensorStateClass.TOTAL, SensorStateClass.TOTAL_INCREASING
+    precipitation = SensorDeviceClass.PRECIPITATION
+    intensity = SensorDeviceClass.PRECIPITATION_INTENSITY
+    measurement = SensorStateClass.MEASUREMENT
+    # Daily and total rainfall of the seeded 5 and 10 flips and rate of the two tips, 2 ml each.
+    day_mm = round(5 * 2.0 * FACTOR, 1)
+    sum_mm = round(10 * 2.0 * FACTOR, 1)
+    rate_mm = round(4.0 * FACTOR, 1)
+    keys = (
+        "native_unit_of_measurement",
+        "icon",
+        "device_class",
+        "state_class",
+        "native_value",
     )
-
-    entity = DailyOnCountSensorEntity(data_handler)
-    entity.hass = hass
-
-    # Restore same day
-    mock_state = MagicMock()
-    mock_state.state = "3"
-    mock_state.last_updated = datetime.now(dt_util.get_default_time_zone())
-    with patch(
-        "homeassistant.helpers.restore_state.RestoreEntity.async_get_last_state",
-        return_value=mock_state,
-    ):
-        await entity.async_added_to_hass()
-        assert data_handler._flips_on == 3
-
-    # Restore older day
-    mock_state.last_updated = datetime.now(dt_util.get_default_time_zone()) - timedelta(
-        days=1
+    # One row of expected values per entity, in the order in which they are added
+    # fmt: off
+    table = [
+        ("daily_on", "counts", "mdi:counter", None, total, 3),
+        ("daily_off", "counts", "mdi:counter", None, total, 2),
+        ("total_on", "counts", "mdi:counter", None, increasing, 6),
+        ("total_off", "counts", "mdi:counter", None, increasing, 4),
+        ("daily_rain", "mm", "mdi:weather-pouring", precipitation, total, day_mm),
+        ("total_rain", "mm", "mdi:weather-pouring", precipitation, increasing, sum_mm),
+        ("daily_tilt", "tips", "mdi:counter", None, total, 5),
+        ("total_tilt", "tips", "mdi:counter", None, increasing, 10),
+        ("rate", "mm/h", "mdi:weather-rainy", intensity, measurement, rate_mm),
+    ]
+    # fmt: on
+    for entity, (key, *row) in zip(added_entities, table, strict=True):
+        expected = {
+            "unique_id": EXPECTED_UNIQUE_IDS[key],
+            "name": EXPECTED_NAMES[key],
+            **dict(zip(keys, row, strict=True)),
+        }
+        actual = {attr: getattr(entity, attr) for attr in expected}
+        assert actual == expected, f"{key}: {actual} != {expected}"
+
+    # Device info shared, as one object held by the data handler
+    assert data_handler.device_info == DeviceInfo(
+        identifiers={(DOMAIN, data_handler.unique_id)},
+        name=data_handler.name,
     )
-    with patch(
-        "homeassistant.helpers.restore_state.RestoreEntity.async_get_last_state",
-        return_value=mock_state,
-    ):
-        await entity.async_added_to_hass()
-        assert data_handler._flips_on == 0
-
-    # Invalid state
-    mock_state.state = "invalid"
-    with patch(
-        "homeassistant.helpers.restore_state.RestoreEntity.async_get_last_state",
-        return_value=mock_state,
-    ):
-        await entity.async_added_to_hass()
-        assert data_handler._flips_on == 0
-
-    # No state
-    with patch(
-        "homeassistant.helpers.restore_state.RestoreEntity.async_get_last_state",
-        return_value=None,
-    ):
-        await entity.async_added_to_hass()
-        assert data_handler._flips_on == 0
+    for entity in added_entities:
+        assert entity.device_info is data_handler.device_info
 
 
 @pytest.mark.asyncio
-async def test_daily_off_restore(
-    hass: HomeAssistant, enable_custom_integrations, freezer
+@pytest.mark.parametrize(
+    ("key", "attr", "daily"),
+    [
+        ("daily_on", "_flips_on", True),
+        ("daily_off", "_flips_off", True),
+        ("total_on", "_total_flips_on", False),
+        ("total_off", "_total_flips_off", False),
+    ],
+)
+async def test_restore(
+    hass: HomeAssistant,
+    data_handler,
+    last_states,
+    enable_custom_integrations,
+    key,
+    attr,
+    daily,
 ) -> None:
-    """Test restoring daily off count."""
-    freezer.move_to("2025-07-17 12:00:00+00:00")
-    hass.config.time_zone = "UTC"
-
-    data_handler = RainSensorDataHandler(
-        hass,
-        "binary_sensor.rain_tip",
-        2.0,
-        2.0,
-        100.0,
-        "Test Rain",
-        "test_unique",
-        False,
-    )
-
-    entity = DailyOffCountSensorEntity(data_handler)
-    entity.hass = hass
-
-    # Restore same day
-    mock_state = MagicMock()
-    mock_state.state = "2"
-    mock_state.last_updated = datetime.now(dt_util.get_default_time_zone())
-    with patch(
-        "homeassistant.helpers.restore_state.RestoreEntity.async_get_last_state",
-        return_value=mock_state,
-    ):
-        await entity.async_added_to_hass()
-        assert data_handler._flips_off == 2
-
-    # Restore older day
-    mock_state.last_updated = datetime.now(dt_util.get_default_time_zone()) - timedelta(
-        days=1
+    """Test restoring a count from its last entity state."""
+    entity = RainSensorEntity(data_handler, DESCRIPTIONS[key])
+    # The restore looks the entity id up in the entity registry by unique id.
+    entity.entity_id = (
+        er.async_get(hass)
+        .async_get_or_create(
+            "sensor",
+            DOMAIN,
+            entity.unique_id,
+            suggested_object_id=f"test_rain_{key}_count",
+        )
+        .entity_id
     )
-    with patch(
-        "homeassistant.helpers.restore_state.RestoreEntity.async_get_last_state",
-        return_value=mock_state,
-    ):
-        await entity.async_added_to_hass()
-        assert data_handler._flips_off == 0
+    data_handler.register_entities({key: entity})
+
+    now = datetime.now(_TZ)
+    prev_day = now - timedelta(days=1)
+    cases = [
+        ("3", now, 3),  # Same day
+        ("16.0", now, 16),  # Float formatted
+        ("invalid", now, 0),  # Invalid state
+        # Daily counts from an older day are dropped, totals are kept
+        ("3", prev_day, 0 if daily else 3),
+        (None, None, 0),  # No state
+    ]
+    for state, last_updated, expected in cases:
+        last_states.clear()
+        if state is not None:
+            # The handler only reads the state and its last update, so a plain namespace will do
+            last_states[entity.entity_id] = StoredState(
+                SimpleNamespace(state=state, last_updated=last_updated), None, now
+            )
+        data_handler.async_restore_all()
+        assert getattr(data_handler, attr) == expected
 
 
 @pytest.mark.asyncio
-async def test_total_on_restore(
-    hass: HomeAssistant, enable_custom_integrations
+async def test_restore_all_counts(
+    hass: HomeAssistant,
+    config_entry,
+    enable_custom_integrations,
+    last_states,
+    hass_storage,
 ) -> None:
-    """Test restoring total on count."""
-    data_handler = RainSensorDataHandler(
-        hass,
-        "binary_sensor.rain_tip",
-        2.0,
-        2.0,
-        100.0,
-        "Test Rain",
-        "test_unique",
-        False,
-    )
-
-    entity = TotalOnCountSensorEntity(data_handler)
-    entity.hass = hass
-
-    mock_state = MagicMock()
-    mock_state.state = "10"
-    with patch(
-        "homeassistant.helpers.restore_state.RestoreEntity.async_get_last_state",
-        return_value=mock_state,
-    ):
-        await entity.async_added_to_hass()
-        assert data_handler._total_flips_on == 10
-
-    # Invalid
-    mock_state.state = "invalid"
-    with patch(
-        "homeassistant.helpers.restore_state.RestoreEntity.async_get_last_state",
-        return_value=mock_state,
-    ):
-        await entity.async_added_to_hass()
-        assert data_handler._total_flips_on == 0
-
-    # No state
-    with patch(
-        "homeassistant.helpers.restore_state.RestoreEntity.async_get_last_state",
-        return_value=None,
+    """Test all counts are migrated from the entity states when nothing is stored."""
+    # The entities are registered from an earlier run, which also left their last states.
+    entity_registry = er.async_get(hass)
+    for key in ("daily_on", "daily_off", "total_on", "total_off"):
+        entity_registry.async_get_or_create(
+            "sensor",
+            DOMAIN,
+            f"{config_entry.unique_id}_{key}_count",
+            suggested_object_id=f"test_rain_{key}_count",
+            config_entry=config_entry,
+        )
+    now = dt_util.utcnow()
+    for entity_id, state in (
+        ("sensor.test_rain_daily_on_count", "3"),
+        ("sensor.test_rain_daily_off_count", "2"),
+        ("sensor.test_rain_total_on_count", "10"),
+        ("sensor.test_rain_total_off_count", "15"),
     ):
-        await entity.async_added_to_hass()
-        assert data_handler._total_flips_on == 0
-
-
-@pytest.mark.asyncio
-async def test_total_off_restore(
-    hass: HomeAssistant, enable_custom_integrations
-) -> None:
-    """Test restoring total off count."""
-    data_handler = RainSensorDataHandler(
-        hass,
-        "binary_sensor.rain_tip",
-        2.0,
-        2.0,
-        100.0,
-        "Test Rain",
-        "test_unique",
-        False,
-    )
-
-    entity = TotalOffCountSensorEntity(data_handler)
-    entity.hass = hass
+        last_states[entity_id] = StoredState(State(entity_id, state), None, now)
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
 
-    mock_state = MagicMock()
-    mock_state.state = "15"
-    with patch(
-        "homeassistant.helpers.restore_state.RestoreEntity.async_get_last_state",
-        return_value=mock_state,
-    ):
-        await entity.async_added_to_hass()
-        assert data_handler._total_flips_off == 15
+    # The restored total is the first state written, no zero is published before it.
+    assert [
+        event.data["new_state"].state
+        for event in events
+        if event.data["entity_id"] == "sensor.test_rain_total_on_count"
+    ] == ["10"]
+    assert hass.states.get("sensor.test_rain_daily_on_count").state == "3"
+    assert hass.states.get("sensor.test_rain_daily_off_count").state == "2"
+    assert hass.states.get("sensor.test_rain_total_on_count").state == "10"
+    assert hass.states.get("sensor.test_rain_total_off_count").state == "15"
+    assert hass.states.get("sensor.test_rain_total_tilt_count").state == "25"
+
+    # The migrated counts are saved at once, without waiting for a flip
+    data = hass_storage[f"{DOMAIN}.{config_entry.unique_id}"]["data"]
+    assert data["flips_on"] == 3
+    assert data["flips_off"] == 2
+    assert data["total_flips_on"] == 10
+    assert data["total_flips_off"] == 15